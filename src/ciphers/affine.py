@@ -1,23 +1,122 @@
 import math  # Used for gcd() to check if 'a' is coprime with 26
+from functools import lru_cache  # Cache translation tables per key
+
+from ciphers.caesar import ALPHABET  # "A".."Z", used to build translation tables
+from ciphers import native           # Optional vectorized C kernel (falls back to str.translate if not built)
+from ciphers.stream import CHUNK_SIZE, read_chunks
+
+
+# Precomputed inverses modulo 26: _INV26[x] is the inverse of x, or None if gcd(x, 26) ≠ 1.
+# Every cipher in this project works mod 26, so this turns mod_inverse into a single lookup.
+_INV26 = (None, 1, None, 9, None, 21, None, 15, None, 3, None, 19, None,
+          None, None, 7, None, 23, None, 11, None, 5, None, 17, None, 25)
 
 
 def mod_inverse(a: int, m: int = 26) -> int or None:
     """
-    Compute the modular multiplicative inverse of 'a' modulo 'm' using brute force.
+    Compute the modular multiplicative inverse of 'a' modulo 'm' using the Extended Euclidean Algorithm.
     
     The inverse of 'a' mod 'm' is a number 'i' such that (a * i) ≡ 1 (mod m).
     This is needed for decryption because we must "undo" the multiplication by 'a'.
     
-    This function tries i = 1 to m-1 until it finds the correct inverse.
+    The algorithm runs Euclid's gcd on (a, m) while tracking the Bezout coefficient 's'
+    such that a * s ≡ r (mod m) for every remainder r. When the remainder reaches
+    gcd(a, m) = 1, 's' is the inverse. This takes O(log m) steps instead of trying
+    every i = 1 to m-1.
     Returns None if no inverse exists (i.e., if gcd(a, m) ≠ 1).
     
+    For the common case m = 26 the answer is read from the precomputed _INV26 table.
+    
     Example: mod_inverse(3, 26) → 9, because 3 * 9 = 27 ≡ 1 mod 26
     """
-    a = a % m                                            # Normalize a to be within 0–25
-    for i in range(1, m):                                # Try all possible values
-        if (a * i) % m == 1:                              # Check if this is the inverse
-            return i
-    return None                                          # No inverse found
+    if m == 26:
+        return _INV26[a % 26]                            # Fast path: table lookup
+    
+    old_r, r = a % m, m                                  # Remainders (start with a normalized to 0–25)
+    old_s, s = 1, 0                                      # Bezout coefficients for 'a'
+    while r:
+        q = old_r // r                                   # Quotient of this division step
+        old_r, r = r, old_r - q * r                      # Standard Euclid step
+        old_s, s = s, old_s - q * s                      # Track coefficient alongside it
+    if old_r != 1:                                       # gcd(a, m) ≠ 1 → no inverse
+        return None
+    return old_s % m                                     # Bring coefficient into range 0–(m-1)
+
+
+def mod_inverse_ct(a: int, m: int = 26) -> int or None:
+    """
+    Modular inverse without secret-dependent branching or loop counts ("constant-time" variant).
+    
+    mod_inverse's running time depends on the value being inverted (the number of Euclid steps
+    varies with 'a'), which can leak information through timing in real cryptographic code.
+    This variant avoids that:
+    - m = 26: a single lookup in the precomputed _INV26 table, the same work for every 'a'.
+    - any other m: Fermat's little theorem, a⁻¹ ≡ a^(m-2) (mod m), a fixed exponentiation.
+      This is only correct when m is prime. m is not tested for primality up front (that would
+      cost far more than the inversion for cryptographic-size moduli); if the result turns out
+      wrong even though an inverse exists, m cannot be prime and ValueError is raised.
+      Use mod_inverse for composite moduli.
+    Returns None if no inverse exists.
+    
+    Note: Python integers are not truly constant-time; this removes the algorithmic
+    timing leak, which is what matters for the ciphers in this project.
+    
+    Example: mod_inverse_ct(3, 26) → 9, mod_inverse_ct(3, 7) → 5
+    """
+    if m == 26:
+        return _INV26[a % 26]                            # Same table as mod_inverse
+    a = a % m
+    inv = pow(a, m - 2, m)                               # Fermat: a^(m-1) ≡ 1 → a^(m-2) is the inverse
+    if (a * inv) % m == 1:
+        return inv
+    if math.gcd(a, m) == 1:                              # An inverse exists, so Fermat failed → m not prime
+        raise ValueError("m must be prime (or 26)")
+    return None                                          # Truly no inverse
+
+
+def batch_mod_inverse(values: list[int], m: int = 26) -> list:
+    """
+    Compute the modular inverses of many values at once using Montgomery's batch inversion trick.
+    
+    Instead of inverting every value separately, multiply them all together,
+    invert that single product, and then peel the individual inverses back out:
+        prefix[i]   = values[0] * ... * values[i-1]  (mod m)
+        inv(v[i])   = inv(prefix[i+1]) * prefix[i]   (mod m)
+    This needs only one call to mod_inverse plus about 3 multiplications per value.
+    
+    The product is only invertible if every value is. If any value has no inverse,
+    each value is inverted on its own instead, and those without one come back as None.
+    
+    Example: batch_mod_inverse([3, 5, 7], 26) → [9, 21, 15]
+    """
+    n = len(values)
+    prefix = [1] * (n + 1)                               # prefix[i] = product of the first i values
+    for i, v in enumerate(values):
+        prefix[i + 1] = (prefix[i] * v) % m
+    
+    inv_all = mod_inverse(prefix[n], m)                  # The single real inversion
+    if inv_all is None:                                  # Some value is not invertible
+        return [mod_inverse(v, m) for v in values]
+    
+    result = [0] * n
+    for i in range(n - 1, -1, -1):                       # Walk backwards, peeling off one value at a time
+        result[i] = (inv_all * prefix[i]) % m            # inv(v[i]) = inv(v[0..i]) * (v[0..i-1])
+        inv_all = (inv_all * values[i]) % m              # Now inv_all = inv(v[0..i-1])
+    return result
+
+
+@lru_cache(maxsize=64)
+def _affine_table(a: int, b: int) -> dict:
+    """
+    Build the str.translate table for the Affine map x → (a * x + b) mod 26.
+    
+    The whole alphabet is encrypted once and A-Z / a-z are mapped to the result
+    (case preserved, anything not in the table is left unchanged by translate).
+    Cached per (a, b), so repeated calls with the same key reuse the table.
+    Callers pass a and b already reduced mod 26 so equivalent keys share one entry.
+    """
+    cipher_alphabet = "".join(chr((a * i + b) % 26 + 65) for i in range(26))
+    return str.maketrans(ALPHABET + ALPHABET.lower(), cipher_alphabet + cipher_alphabet.lower())
 
 
 def affine_encrypt(text: str, a: int, b: int) -> str:
@@ -36,20 +135,12 @@ def affine_encrypt(text: str, a: int, b: int) -> str:
     if math.gcd(a, 26) != 1:
         raise ValueError("a must be coprime with 26 (gcd(a, 26) == 1)")
     
-    result = ""
-    for char in text:
-        if char.isupper():                                   # Handle uppercase letters
-            # Formula: (a * (char - 'A') + b) mod 26 + 'A'
-            plaintext_num = ord(char) - 65                    # A → 0, B → 1, ...
-            ciphertext_num = (a * plaintext_num + b) % 26
-            result += chr(ciphertext_num + 65)               # Back to letter
-        elif char.islower():                                 # Handle lowercase letters
-            plaintext_num = ord(char) - 97                    # a → 0, b → 1, ...
-            ciphertext_num = (a * plaintext_num + b) % 26
-            result += chr(ciphertext_num + 97)
-        else:
-            result += char                                   # Keep spaces, punctuation, etc.
-    return result
+    # Long ASCII text: use the vectorized C kernel
+    if native.use_affine(text):
+        return native.affine_apply(text.encode("ascii"), a, b).decode("ascii")
+    
+    # Translate A-Z and a-z in one pass (case preserved, non-letters untouched)
+    return text.translate(_affine_table(a % 26, b % 26))
 
 
 def affine_decrypt(text: str, a: int, b: int) -> str:
@@ -60,22 +151,39 @@ def affine_decrypt(text: str, a: int, b: int) -> str:
     - Formula: plaintext_number = a⁻¹ * (ciphertext_number - b) mod 26
     - Preserves case and non-letters
     """
-    # Find the inverse of 'a' modulo 26
-    inv_a = mod_inverse(a, 26)
-    if not inv_a:
+    # Find the inverse of 'a' modulo 26 (table lookup, no key-dependent timing)
+    inv_a = mod_inverse_ct(a, 26)
+    if inv_a is None:
+        raise ValueError("a must be coprime with 26 (gcd(a, 26) == 1)")
+    
+    # Long ASCII text: decryption is itself an Affine map, x → inv_a * x - inv_a * b
+    if native.use_affine(text):
+        return native.affine_apply(text.encode("ascii"), inv_a, -inv_a * b).decode("ascii")
+    
+    # Translate with the table of that same map
+    return text.translate(_affine_table(inv_a, (-inv_a * b) % 26))
+
+
+def affine_encrypt_stream(in_fp, out_fp, a: int, b: int, chunk_size: int = CHUNK_SIZE):
+    """
+    Affine-encrypt the text file 'in_fp' into 'out_fp', one chunk at a time.
+    The key is checked before anything is read; after that each chunk is simply passed
+    through affine_encrypt, since no character depends on its neighbours.
+    """
+    # Validate the key up front so an empty file still reports a bad 'a'
+    if math.gcd(a, 26) != 1:
+        raise ValueError("a must be coprime with 26 (gcd(a, 26) == 1)")
+    
+    for chunk in read_chunks(in_fp, chunk_size):
+        out_fp.write(affine_encrypt(chunk, a, b))
+
+
+def affine_decrypt_stream(in_fp, out_fp, a: int, b: int, chunk_size: int = CHUNK_SIZE):
+    """
+    Decrypt an open text file into another one chunk by chunk (see affine_encrypt_stream).
+    """
+    if mod_inverse_ct(a, 26) is None:
         raise ValueError("a must be coprime with 26 (gcd(a, 26) == 1)")
     
-    result = ""
-    for char in text:
-        if char.isupper():
-            ciphertext_num = ord(char) - 65
-            # Reverse formula: inv_a * (ciphertext_num - b) mod 26
-            plaintext_num = (inv_a * (ciphertext_num - b)) % 26
-            result += chr(plaintext_num + 65)
-        elif char.islower():
-            ciphertext_num = ord(char) - 97
-            plaintext_num = (inv_a * (ciphertext_num - b)) % 26
-            result += chr(plaintext_num + 97)
-        else:
-            result += char
-    return result
\ No newline at end of file
+    for chunk in read_chunks(in_fp, chunk_size):
+        out_fp.write(affine_decrypt(chunk, a, b))
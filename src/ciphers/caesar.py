@@ -1,3 +1,23 @@
+from functools import lru_cache  # Cache translation tables per shift
+
+from ciphers import native  # Optional vectorized C kernel (falls back to str.translate if not built)
+from ciphers.stream import CHUNK_SIZE, read_chunks
+
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"  # Plain alphabet used to build translation tables
+
+
+@lru_cache(maxsize=26)
+def _shift_table(shift: int) -> dict:
+    """
+    Build the str.translate table for a Caesar shift (0-25), cached per shift.
+    
+    Maps A-Z → shifted A-Z and a-z → shifted a-z; every other character is left alone.
+    """
+    shifted = ALPHABET[shift:] + ALPHABET[:shift]    # e.g. shift=3 → "DEFGHIJKLMNOPQRSTUVWXYZABC"
+    return str.maketrans(ALPHABET + ALPHABET.lower(), shifted + shifted.lower())
+
+
 def caesar_encrypt(text: str, shift: int) -> str:
     """
     Encrypts the input text using the Caesar Cipher.
@@ -5,7 +25,7 @@ def caesar_encrypt(text: str, shift: int) -> str:
     The Caesar Cipher is a simple substitution cipher where each letter
     is shifted forward in the alphabet by a fixed number of positions ('shift').
     
-    - Only letters are shifted.
+    - Only the letters A-Z and a-z are shifted.
     - Case is preserved (uppercase stays uppercase, lowercase stays lowercase).
     - Non-letter characters (spaces, punctuation, numbers) remain unchanged.
     - The shift wraps around the alphabet (e.g., Z + 1 → A).
@@ -17,23 +37,12 @@ def caesar_encrypt(text: str, shift: int) -> str:
     shift = shift % 26                    # Normalize shift: 27 → 1, -1 → 25, etc.
                                           # Ensures shift is between 0 and 25
     
-    result = ""                           # Will hold the encrypted text
+    # Long ASCII text: shift it with the vectorized C kernel (Caesar = Affine with a = 1)
+    if native.use_affine(text):
+        return native.affine_apply(text.encode("ascii"), 1, shift).decode("ascii")
     
-    for char in text:                     # Process each character one by one
-        if char.isupper():                # Handle uppercase letters (A-Z)
-            # Convert to 0-25: subtract ord('A') = 65
-            # Add shift, wrap with % 26, then add 65 back to get new letter
-            encrypted_char = chr((ord(char) - 65 + shift) % 26 + 65)
-            result += encrypted_char
-        elif char.islower():              # Handle lowercase letters (a-z)
-            # Same logic, but base is ord('a') = 97
-            encrypted_char = chr((ord(char) - 97 + shift) % 26 + 97)
-            result += encrypted_char
-        else:
-            # Non-letters (spaces, punctuation, digits) are copied as-is
-            result += char
-    
-    return result
+    # str.translate rewrites the whole text in a single C-level pass
+    return text.translate(_shift_table(shift))
 
 
 def caesar_decrypt(text: str, shift: int) -> str:
@@ -51,4 +60,20 @@ def caesar_decrypt(text: str, shift: int) -> str:
     """
     # Shifting backward by 'shift' is same as shifting forward by (26 - shift)
     # But using negative shift is clearer and works perfectly
-    return caesar_encrypt(text, -shift)
\ No newline at end of file
+    return caesar_encrypt(text, -shift)
+
+
+def caesar_encrypt_stream(in_fp, out_fp, shift: int, chunk_size: int = CHUNK_SIZE):
+    """
+    Caesar-encrypt the text file 'in_fp' into 'out_fp', one chunk at a time.
+    Every character is shifted on its own, so chunk boundaries need no special handling.
+    """
+    for chunk in read_chunks(in_fp, chunk_size):
+        out_fp.write(caesar_encrypt(chunk, shift))
+
+
+def caesar_decrypt_stream(in_fp, out_fp, shift: int, chunk_size: int = CHUNK_SIZE):
+    """
+    Decrypt an open text file into another one chunk by chunk (see caesar_encrypt_stream).
+    """
+    caesar_encrypt_stream(in_fp, out_fp, -shift, chunk_size)
@@ -1,17 +1,34 @@
+from functools import partial  # Bind the key when mapping over many texts
+
 # Import the modular inverse function from affine.py
 # This is needed for decryption to compute the inverse of the key matrix
-from ciphers.affine import mod_inverse
+from ciphers.affine import mod_inverse_ct
+from ciphers import native  # Optional C kernel for the digraph loop (falls back to Python if not built)
+from ciphers.stream import CHUNK_SIZE, read_chunks
+from ciphers.parallel import map_texts
+
+
+# Byte table mapping 'A'-'Z' and 'a'-'z' straight to 0-25 (other entries are never used)
+LETTERS_TO_NUMBERS = bytes((c - 65) % 32 if 65 <= c <= 90 or 97 <= c <= 122 else 255 for c in range(256))
+
+# Every byte that is not a letter — deleted in the same bytes.translate pass
+NON_LETTERS = bytes(c for c in range(256) if not (65 <= c <= 90 or 97 <= c <= 122))
+
+# Byte table mapping 0 → 'A', 1 → 'B', ..., 25 → 'Z'
+NUMBERS_TO_LETTERS = bytes((c + 65) % 256 for c in range(256))
 
 
 def text_to_numbers(text: str):
     """
     Convert alphabetic characters in the input text to numbers (A=0, B=1, ..., Z=25).
-    Non-alphabetic characters are ignored, and the text is converted to uppercase.
+    Non-alphabetic characters are ignored, and case does not matter (a and A are both 0).
+    Only the letters A-Z count; other alphabets (e.g. accented letters) are ignored too.
     
     Example: "Hello!" -> [7, 4, 11, 11, 14]  (H=7, E=4, L=11, L=11, O=14)
     """
-    text = text.upper()                               # Ensure all letters are uppercase
-    return [ord(c) - 65 for c in text if c.isalpha()] # ord('A') = 65 → subtract to get 0-25
+    # Drop non-ASCII, delete non-letters and map A-Z / a-z → 0-25, all in one C-level pass
+    # (no uppercase copy of the text and no per-character Python work)
+    return list(text.encode("ascii", "ignore").translate(LETTERS_TO_NUMBERS, NON_LETTERS))
 
 
 def numbers_to_text(nums):
@@ -23,6 +40,39 @@ def numbers_to_text(nums):
     return "".join(chr(n + 65) for n in nums)         # chr(65) = 'A', so add 65 to get letter
 
 
+# Inputs with at least this many numbers use a precomputed digraph table (see apply_key_matrix).
+# Below it, building the 676-entry table costs more than it saves.
+TABLE_THRESHOLD = 2048
+
+
+def apply_key_matrix(nums, matrix: list[list[int]]) -> str:
+    """
+    Multiply every digraph in 'nums' by a 2x2 matrix mod 26 and return the result as letters.
+    
+    Each pair [x, y] is treated as a column vector:
+        out1 = (m00 * x + m01 * y) mod 26
+        out2 = (m10 * x + m11 * y) mod 26
+    
+    If the C kernel in native.c has been built, it does the whole loop.
+    Otherwise, for long inputs the matrix is fixed, so all 26 × 26 possible digraphs are
+    computed once into a table indexed by x * 26 + y; each pair then costs a single list lookup.
+    'nums' must have even length.
+    """
+    if native.available:                               # Compiled kernel: one C loop over all pairs
+        return native.hill_apply(bytes(nums), matrix).translate(NUMBERS_TO_LETTERS).decode("ascii")
+    
+    (m00, m01), (m10, m11) = matrix
+    pairs = zip(nums[0::2], nums[1::2])                # (x, y) digraphs
+    
+    if len(nums) < TABLE_THRESHOLD:                    # Short input → compute each pair directly
+        return "".join([chr((m00 * x + m01 * y) % 26 + 65) + chr((m10 * x + m11 * y) % 26 + 65)
+                        for x, y in pairs])
+    
+    table = [chr((m00 * x + m01 * y) % 26 + 65) + chr((m10 * x + m11 * y) % 26 + 65)
+             for x in range(26) for y in range(26)]
+    return "".join([table[x * 26 + y] for x, y in pairs])
+
+
 def hill_encrypt(text: str, key_matrix: list[list[int]]):
     """
     Encrypt plaintext using the 2x2 Hill Cipher.
@@ -41,20 +91,31 @@ def hill_encrypt(text: str, key_matrix: list[list[int]]):
     if len(nums) % 2 == 1:
         nums.append(23)  # 23 corresponds to 'X'
     
-    result = []                                        # Will hold encrypted numbers
+    # Step 3-6: Multiply each digraph (column vector) by the key matrix mod 26
+    return apply_key_matrix(nums, key_matrix)
+
+
+def invert_key_matrix(key_matrix: list[list[int]]) -> list[list[int]]:
+    """
+    Compute the inverse of a 2x2 key matrix modulo 26 (steps 1-4 of hill_decrypt).
     
-    # Step 3-5: Process each digraph (pair of letters)
-    for i in range(0, len(nums), 2):
-        vec = [nums[i], nums[i + 1]]                   # Current plaintext vector (column)
-        
-        # Matrix multiplication: key_matrix * vec mod 26
-        c1 = (key_matrix[0][0] * vec[0] + key_matrix[0][1] * vec[1]) % 26
-        c2 = (key_matrix[1][0] * vec[0] + key_matrix[1][1] * vec[1]) % 26
-        
-        new_vec = [c1, c2]
-        result.extend(new_vec)                         # Add ciphertext pair to result
+    Raises ValueError if the determinant has no inverse mod 26.
+    """
+    # Step 1: Determinant = (ad - bc) mod 26 for matrix [[a,b],[c,d]]
+    (a, b), (c, d) = key_matrix
+    det = (a * d - b * c) % 26
+    
+    # Step 2: Find inverse of determinant modulo 26
+    inv_det = mod_inverse_ct(det, 26)
+    if inv_det is None:
+        raise ValueError("Key matrix is not invertible modulo 26 (determinant has no inverse)")
+    
+    # Step 4: Compute inverse matrix = (1/det) * adjugate mod 26
+    # Adjugate: swap diagonal, negate off-diagonal
+    adjugate = [[d, -b], [-c, a]]
+    inv_matrix = [[(x * inv_det) % 26 for x in row] for row in adjugate]
     
-    return numbers_to_text(result)                     # Convert final numbers back to text
+    return inv_matrix
 
 
 def hill_decrypt(text: str, key_matrix: list[list[int]]):
@@ -69,20 +130,8 @@ def hill_decrypt(text: str, key_matrix: list[list[int]]):
     5. Multiply each ciphertext digraph by inverse matrix mod 26.
     6. Convert back to letters.
     """
-    # Step 1: Determinant = (ad - bc) mod 26 for matrix [[a,b],[c,d]]
-    det = (key_matrix[0][0] * key_matrix[1][1] - key_matrix[0][1] * key_matrix[1][0]) % 26
-    
-    # Step 2: Find inverse of determinant modulo 26
-    inv_det = mod_inverse(det, 26)
-    if not inv_det:
-        raise ValueError("Key matrix is not invertible modulo 26 (determinant has no inverse)")
-    
-    # Step 4: Compute inverse matrix = (1/det) * adjugate mod 26
-    # Adjugate: swap diagonal, negate off-diagonal
-    inv_matrix = [
-        [ key_matrix[1][1] * inv_det % 26,          (-key_matrix[0][1] * inv_det) % 26],
-        [(-key_matrix[1][0] * inv_det) % 26,           key_matrix[0][0] * inv_det % 26]
-    ]
+    # Step 1-4: Inverse of the key matrix mod 26 (raises ValueError if it has none)
+    inv_matrix = invert_key_matrix(key_matrix)
     
     nums = text_to_numbers(text)                       # Convert ciphertext to numbers
     
@@ -90,15 +139,58 @@ def hill_decrypt(text: str, key_matrix: list[list[int]]):
     if len(nums) % 2 != 0:
         raise ValueError("Ciphertext length must be even (invalid or corrupted)")
     
-    result = []
+    # Step 5-6: Decrypt each digraph using inverse matrix
+    return apply_key_matrix(nums, inv_matrix)
+
+
+def hill_encrypt_stream(in_fp, out_fp, key_matrix: list[list[int]], chunk_size: int = CHUNK_SIZE):
+    """
+    Hill-encrypt the text file 'in_fp' into 'out_fp', one chunk at a time.
     
-    # Step 5: Decrypt each digraph using inverse matrix
-    for i in range(0, len(nums), 2):
-        vec = [nums[i], nums[i + 1]]                   # Ciphertext vector
-        
-        p1 = (inv_matrix[0][0] * vec[0] + inv_matrix[0][1] * vec[1]) % 26
-        p2 = (inv_matrix[1][0] * vec[0] + inv_matrix[1][1] * vec[1]) % 26
-        
-        result.extend([p1, p2])
+    A digraph can straddle a chunk boundary, so when a chunk ends on an odd letter that
+    letter is carried into the next chunk; only at the end of the file is it padded with
+    'X' (23). The output matches hill_encrypt on the whole file.
+    """
+    leftover = []
+    for chunk in read_chunks(in_fp, chunk_size):
+        nums = leftover + text_to_numbers(chunk)
+        leftover = nums[-1:] if len(nums) % 2 else []    # Carry an odd letter forward
+        out_fp.write(apply_key_matrix(nums[:len(nums) - len(leftover)], key_matrix))
     
-    return numbers_to_text(result)                     # Back to plaintext letters
\ No newline at end of file
+    if leftover:
+        out_fp.write(apply_key_matrix(leftover + [23], key_matrix))
+
+
+def hill_decrypt_stream(in_fp, out_fp, key_matrix: list[list[int]], chunk_size: int = CHUNK_SIZE):
+    """
+    Decrypt an open text file into another one chunk by chunk (see hill_encrypt_stream).
+    
+    Raises ValueError if the key is not invertible or the ciphertext has an odd number of letters
+    (in the latter case everything before the last letter has already been written).
+    """
+    inv_matrix = invert_key_matrix(key_matrix)
+    
+    leftover = []
+    for chunk in read_chunks(in_fp, chunk_size):
+        nums = leftover + text_to_numbers(chunk)
+        leftover = nums[-1:] if len(nums) % 2 else []    # Carry an odd letter forward
+        out_fp.write(apply_key_matrix(nums[:len(nums) - len(leftover)], inv_matrix))
+    
+    if leftover:
+        raise ValueError("Ciphertext length must be even (invalid or corrupted)")
+
+
+def hill_encrypt_many(texts, key_matrix: list[list[int]], max_workers: int = None) -> list[str]:
+    """
+    Encrypt many messages with the same key, spreading large batches across CPU cores
+    (see ciphers.parallel.map_texts). Returns the ciphertexts in input order.
+    """
+    return map_texts(partial(hill_encrypt, key_matrix=key_matrix), texts, max_workers)
+
+
+def hill_decrypt_many(texts, key_matrix: list[list[int]], max_workers: int = None) -> list[str]:
+    """
+    Decrypt many messages with the same key (see hill_encrypt_many).
+    """
+    invert_key_matrix(key_matrix)                      # Fail fast on a bad key, before starting workers
+    return map_texts(partial(hill_decrypt, key_matrix=key_matrix), texts, max_workers)
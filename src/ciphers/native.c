@@ -0,0 +1,45 @@
+/*
+ * Optional C kernels for the cipher hot loops, loaded from Python via ctypes (see native.py).
+ *
+ * Build (from src/ciphers):
+ *     gcc -O3 -march=native -shared -fPIC -o libnative.so native.c
+ *
+ * If libnative.so is missing the ciphers fall back to their pure-Python implementations.
+ */
+#include <stddef.h>
+#include <stdint.h>
+
+/*
+ * Hill cipher: multiply every digraph (in[2i], in[2i+1]) by the 2x2 matrix [[k00, k01], [k10, k11]] mod 26.
+ * Inputs are letter numbers 0-25 and the matrix entries must already be reduced mod 26.
+ */
+void hill_apply(const uint8_t *in, uint8_t *out, size_t npairs,
+                uint8_t k00, uint8_t k01, uint8_t k10, uint8_t k11)
+{
+    for (size_t i = 0; i < npairs; i++) {
+        unsigned x = in[2 * i], y = in[2 * i + 1];
+        out[2 * i]     = (uint8_t)((k00 * x + k01 * y) % 26);
+        out[2 * i + 1] = (uint8_t)((k10 * x + k11 * y) % 26);
+    }
+}
+
+/*
+ * Affine cipher on ASCII text: every letter x (0-25) becomes (a * x + b) mod 26, case preserved,
+ * every other byte is copied unchanged. Caesar is the special case a = 1, b = shift.
+ * a and b must already be reduced mod 26.
+ *
+ * The loop body is branch-free (letter tests become masks) so the compiler can vectorize it,
+ * processing 32 bytes per iteration with AVX2 when built with -march=native.
+ */
+void affine_apply(const uint8_t *in, uint8_t *out, size_t n, uint8_t a, uint8_t b)
+{
+    for (size_t i = 0; i < n; i++) {
+        uint8_t v = in[i];
+        uint8_t lower = v | 0x20;                        /* Fold case: 'A' → 'a' */
+        int is_letter = (uint8_t)(lower - 'a') < 26;
+        uint8_t base = v & 0x20 ? 'a' : 'A';
+        uint16_t x = (uint8_t)(lower - 'a');
+        uint8_t y = (uint8_t)((uint16_t)(a * x + b) % 26);
+        out[i] = is_letter ? (uint8_t)(base + y) : v;
+    }
+}
@@ -0,0 +1,57 @@
+import ctypes  # Used to load the optional compiled kernels in native.c
+import os
+
+
+# Path of the compiled library (build instructions are at the top of native.c)
+LIB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "libnative.so")
+
+try:
+    _lib = ctypes.CDLL(LIB_PATH)
+    _lib.hill_apply.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_size_t,
+                                ctypes.c_uint8, ctypes.c_uint8, ctypes.c_uint8, ctypes.c_uint8]
+    _lib.hill_apply.restype = None
+    _lib.affine_apply.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_size_t,
+                                  ctypes.c_uint8, ctypes.c_uint8]
+    _lib.affine_apply.restype = None
+except (OSError, AttributeError):
+    # OSError: not built. AttributeError: a stale build missing a newer kernel.
+    # Either way, callers use pure Python.
+    _lib = None
+
+available = _lib is not None
+
+# Texts shorter than this stay on str.translate; below it the ctypes call overhead is not worth it
+AFFINE_THRESHOLD = 64
+
+
+def use_affine(text: str) -> bool:
+    """
+    Whether affine_apply should handle 'text': the kernel is built, the text is long enough
+    to be worth the call overhead, and it is pure ASCII (the kernel works on single bytes).
+    """
+    return available and len(text) >= AFFINE_THRESHOLD and text.isascii()
+
+
+def hill_apply(data: bytes, matrix: list[list[int]]) -> bytes:
+    """
+    Multiply every digraph in 'data' (letter numbers 0-25, even length) by a 2x2 matrix mod 26
+    using the C kernel. Returns the resulting numbers as bytes.
+    
+    Only call this when 'available' is True.
+    """
+    out = ctypes.create_string_buffer(len(data))
+    (m00, m01), (m10, m11) = matrix
+    _lib.hill_apply(data, out, len(data) // 2, m00 % 26, m01 % 26, m10 % 26, m11 % 26)
+    return out.raw
+
+
+def affine_apply(data: bytes, a: int, b: int) -> bytes:
+    """
+    Apply the Affine map x → (a * x + b) mod 26 to every ASCII letter in 'data' using the
+    C kernel (case preserved, other bytes unchanged). Caesar is a = 1, b = shift.
+    
+    Only call this when 'available' is True.
+    """
+    out = ctypes.create_string_buffer(len(data))
+    _lib.affine_apply(data, out, len(data), a % 26, b % 26)
+    return out.raw
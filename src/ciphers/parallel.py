@@ -0,0 +1,28 @@
+import os
+from concurrent.futures import ProcessPoolExecutor  # Processes, not threads: the cipher code holds the GIL
+
+
+# Batches with fewer characters than this in total are processed in this process.
+# Starting a worker pool and pickling the texts costs roughly 10-20 ms, which only pays off
+# once there is a lot of work to split (with the C kernels built, Hill needs ~25 ms per 1M letters).
+PARALLEL_THRESHOLD = 1_000_000
+
+# Number of texts sent to a worker at a time (fewer, larger messages = less pickling overhead)
+CHUNKSIZE = 64
+
+
+def map_texts(fn, texts, max_workers: int = None) -> list:
+    """
+    Apply 'fn' to every text and return the results in the same order.
+    
+    Large batches are spread over a ProcessPoolExecutor (one worker per core by default);
+    small batches, or machines with a single core, just use a plain loop.
+    'fn' must be picklable, e.g. a module-level function or a functools.partial of one.
+    """
+    texts = list(texts)
+    workers = max_workers or os.cpu_count() or 1
+    if workers < 2 or len(texts) < 2 or sum(map(len, texts)) < PARALLEL_THRESHOLD:
+        return [fn(text) for text in texts]
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, texts, chunksize=CHUNKSIZE))
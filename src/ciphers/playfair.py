@@ -1,3 +1,16 @@
+from functools import lru_cache, partial  # Cache key squares and digraph tables per key
+
+from ciphers.stream import CHUNK_SIZE, read_chunks
+from ciphers.parallel import map_texts
+
+
+# Byte table for prepare_text: maps 'J' → 'I', every other byte to itself
+J_TO_I = bytes.maketrans(b"J", b"I")
+
+# Every byte that is not 'A'-'Z' — deleted by prepare_text
+NON_LETTERS = bytes(c for c in range(256) if not 65 <= c <= 90)
+
+
 def prepare_text(text: str) -> str:
     """
     Preprocess the input text for Playfair encryption/decryption.
@@ -15,65 +28,138 @@ def prepare_text(text: str) -> str:
     
     Returns: A string of uppercase letters with even length, ready for digraph processing.
     """
-    text = text.upper().replace("J", "I")                    # Step 1 & 2: Uppercase + J → I
-    text = "".join([c for c in text if c.isalpha()])         # Step 3: Keep only letters
+    prepared, _ = pair_letters(clean_text(text), pad=True)
+    return prepared
+
+
+def clean_text(text: str) -> str:
+    """
+    Steps 1-3 of prepare_text: uppercase, replace 'J' with 'I' and keep only the letters A-Z.
+    """
+    # One C-level pass: uppercase, then map J → I and delete every non-letter byte
+    # (non-ASCII characters are dropped by the encode)
+    return text.upper().encode("ascii", "ignore").translate(J_TO_I, NON_LETTERS).decode("ascii")
+
+
+def pair_letters(text: str, pad: bool = True) -> tuple[str, str]:
+    """
+    Step 4 of prepare_text: split cleaned letters into digraphs, inserting 'X' between doubles.
     
-    prepared = ""
+    If the letters run out with one left over, it is padded with 'X' when 'pad' is True.
+    With pad=False it is returned separately instead, so streaming code can carry it into
+    the next chunk (the pairing never looks further ahead than the next letter).
+    
+    Returns: (prepared digraph text, leftover letter or "")
+    """
+    prepared = []                                            # Collect letters, join once at the end
     i = 0
-    while i < len(text):
-        prepared += text[i]                                  # Add the current letter
+    n = len(text)
+    while i < n:
+        a = text[i]                                          # The current letter
+        if i + 1 < n:
+            b = text[i + 1]                                  # Next letter
+        elif pad:
+            b = "X"                                          # Odd length → pad with 'X'
+        else:
+            return "".join(prepared), a                      # Carry the unpaired letter
         
-        if i + 1 < len(text):                                # If there's a next letter
-            if text[i] == text[i + 1]:                        # Case: double letter (e.g., "LL")
-                prepared += "X"                              # Insert filler 'X'
-                i += 1                                       # Skip the second identical letter next iteration
-            else:
-                prepared += text[i + 1]                      # Add the next letter to form a pair
-                i += 2                                       # Move past the pair
+        if a == b:                                           # Case: double letter (e.g., "LL")
+            prepared.append(a)
+            prepared.append("X")                             # Insert filler 'X'
+            i += 1                                           # Second identical letter starts the next pair
         else:
-            prepared += "X"                                  # Odd length → pad with 'X'
-            i += 1                                           # Done
+            prepared.append(a)
+            prepared.append(b)                               # Form the pair
+            i += 2                                           # Move past the pair
     
-    return prepared
+    return "".join(prepared), ""
 
 
+@lru_cache(maxsize=32)
 def create_playfair_matrix(key: str):
     """
     Build the 5x5 Playfair key square from the given key phrase.
     
     Rules:
     - Convert key to uppercase and replace 'J' with 'I'.
-    - Remove duplicate letters (keep only first occurrence).
+    - Ignore non-letters and remove duplicate letters (keep only first occurrence).
     - Fill remaining spots with the rest of the alphabet (A-Z except J).
-    - Return a 5x5 grid (list of lists).
+    - Return a 5x5 grid (tuple of tuples) together with a {letter: (row, col)} dict,
+      so callers can locate any letter with a single lookup instead of scanning the grid.
+    
+    Results are cached per key, so encrypting many messages with one key builds the square once.
+    The grid is immutable because it is shared between callers; don't modify the dict either.
     
     Example:
         key = "PLAYFAIR EXAMPLE" → matrix starts with P L A Y F I R E X M ...
     """
     key = key.upper().replace("J", "I")                      # Normalize key
-    matrix_str = "".join(dict.fromkeys(key))                 # Remove duplicates, preserve order
     
-    alphabet = "ABCDEFGHIKLMNOPQRSTUVWXYZ"                    # Full alphabet without J
-    for c in alphabet:
-        if c not in matrix_str:
-            matrix_str += c                                  # Append missing letters
+    # Track letters already placed with a 26-bit mask: bit (ord(c) - 65) is set once c is used
+    seen = 0
+    letters = []
+    for c in key + "ABCDEFGHIKLMNOPQRSTUVWXYZ":              # Key first, then the alphabet without J
+        if not "A" <= c <= "Z":                              # Skip spaces, digits, punctuation, ...
+            continue
+        bit = 1 << (ord(c) - 65)
+        if not seen & bit:                                   # First occurrence → keep it
+            seen |= bit
+            letters.append(c)
+    matrix_str = "".join(letters)                            # Exactly 25 distinct letters
     
     # Convert flat string into 5x5 grid
-    matrix = [list(matrix_str[i:i+5]) for i in range(0, 25, 5)]
-    return matrix
+    matrix = tuple(tuple(matrix_str[i:i+5]) for i in range(0, 25, 5))
+    
+    # Index every cell by its letter: position i in the flat string → (row, col)
+    positions = {ch: (i // 5, i % 5) for i, ch in enumerate(matrix_str)}
+    return matrix, positions
+
+
+def create_digraph_table(matrix: tuple[tuple[str, ...], ...], positions: dict, shift: int) -> dict:
+    """
+    Precompute the output for every possible digraph under a given key square.
+    
+    The key square is fixed for a whole message, so each of the 25 × 25 letter pairs
+    always maps to the same output pair. Working them all out once turns the
+    per-digraph work into a single dict lookup.
+    
+    - shift = +1 → encryption (same row → right, same column → down)
+    - shift = -1 → decryption (same row → left, same column → up)
+    - Rectangle rule (opposite corners) is the same in both directions.
+    
+    Returns: {"AB": "XY", ...} for every pair of letters in the square.
+    """
+    table = {}
+    for a, (r1, c1) in positions.items():
+        for b, (r2, c2) in positions.items():
+            if r1 == r2:                                     # Same row
+                out = matrix[r1][(c1 + shift) % 5] + matrix[r2][(c2 + shift) % 5]
+            elif c1 == c2:                                   # Same column
+                out = matrix[(r1 + shift) % 5][c1] + matrix[(r2 + shift) % 5][c2]
+            else:                                            # Rectangle rule
+                out = matrix[r1][c2] + matrix[r2][c1]
+            table[a + b] = out
+    return table
 
 
-def find_position(matrix: list[list[str]], char: str):
+@lru_cache(maxsize=64)
+def get_digraph_table(key: str, shift: int) -> dict:
     """
-    Find the row and column of a given letter in the 5x5 Playfair matrix.
+    Return the digraph table (see create_digraph_table) for a key phrase, cached per (key, shift).
     
-    Returns: (row, col) tuple, or None if not found (should not happen with valid input).
+    Repeated encryption/decryption with the same key skips both the key square and the
+    625-entry table. The returned dict is shared, so it must not be modified.
+    """
+    matrix, positions = create_playfair_matrix(key)
+    return create_digraph_table(matrix, positions, shift)
+
+
+def _substitute(prepared: str, table: dict) -> str:
     """
-    for r in range(5):
-        for c in range(5):
-            if matrix[r][c] == char:
-                return r, c
-    return None  # Safety — should never reach here with proper input
+    Replace every digraph of 'prepared' (even length, from prepare_text/pair_letters)
+    with its entry in a digraph table.
+    """
+    return "".join([table[prepared[i:i + 2]] for i in range(0, len(prepared), 2)])
 
 
 def playfair_encrypt(text: str, key: str) -> str:
@@ -87,28 +173,14 @@ def playfair_encrypt(text: str, key: str) -> str:
          - Same row    → replace with letters to the right (wrap around).
          - Same column → replace with letters below (wrap around).
          - Different row & column → form rectangle and take opposite corners.
+       (All digraphs are precomputed by create_digraph_table, so this is one lookup per pair.)
     
     Returns: Ciphertext (uppercase, no spaces).
     """
-    matrix = create_playfair_matrix(key)
+    table = get_digraph_table(key, 1)                        # Encryption: shift right / down
     text = prepare_text(text)                                # Get clean digraph-ready text
     
-    result = ""
-    for i in range(0, len(text), 2):
-        r1, c1 = find_position(matrix, text[i])              # Position of first letter
-        r2, c2 = find_position(matrix, text[i + 1])          # Position of second letter
-        
-        if r1 == r2:                                         # Same row
-            result += matrix[r1][(c1 + 1) % 5]                # Shift right
-            result += matrix[r2][(c2 + 1) % 5]
-        elif c1 == c2:                                       # Same column
-            result += matrix[(r1 + 1) % 5][c1]                # Shift down
-            result += matrix[(r2 + 1) % 5][c2]
-        else:                                                # Rectangle rule
-            result += matrix[r1][c2]                         # Opposite corners
-            result += matrix[r2][c1]
-    
-    return result
+    return _substitute(text, table)
 
 
 def playfair_decrypt(text: str, key: str) -> str:
@@ -122,22 +194,54 @@ def playfair_decrypt(text: str, key: str) -> str:
     
     Note: Input ciphertext should already be in valid digraph form.
     """
-    matrix = create_playfair_matrix(key)
+    table = get_digraph_table(key, -1)                       # Decryption: shift left / up
     text = prepare_text(text)  # Ensures clean input (removes non-letters, handles J→I)
     
-    result = ""
-    for i in range(0, len(text), 2):
-        r1, c1 = find_position(matrix, text[i])
-        r2, c2 = find_position(matrix, text[i + 1])
-        
-        if r1 == r2:                                         # Same row → shift left
-            result += matrix[r1][(c1 - 1) % 5]
-            result += matrix[r2][(c2 - 1) % 5]
-        elif c1 == c2:                                       # Same column → shift up
-            result += matrix[(r1 - 1) % 5][c1]
-            result += matrix[(r2 - 1) % 5][c2]
-        else:                                                # Rectangle → same as encrypt
-            result += matrix[r1][c2]
-            result += matrix[r2][c1]
-    
-    return result
\ No newline at end of file
+    return _substitute(text, table)
+
+
+def playfair_encrypt_many(texts, key: str, max_workers: int = None) -> list[str]:
+    """
+    Encrypt many messages with the same key, spreading large batches across CPU cores
+    (see ciphers.parallel.map_texts). Returns the ciphertexts in input order.
+    """
+    return map_texts(partial(playfair_encrypt, key=key), texts, max_workers)
+
+
+def playfair_decrypt_many(texts, key: str, max_workers: int = None) -> list[str]:
+    """
+    Decrypt many messages with the same key (see playfair_encrypt_many).
+    """
+    return map_texts(partial(playfair_decrypt, key=key), texts, max_workers)
+
+
+def playfair_encrypt_stream(in_fp, out_fp, key: str, chunk_size: int = CHUNK_SIZE):
+    """
+    Playfair-encrypt the text file 'in_fp' into 'out_fp', one chunk at a time.
+    The output matches playfair_encrypt on the whole file (see _playfair_stream for how
+    digraphs that cross a chunk boundary are handled).
+    """
+    _playfair_stream(in_fp, out_fp, get_digraph_table(key, 1), chunk_size)
+
+
+def playfair_decrypt_stream(in_fp, out_fp, key: str, chunk_size: int = CHUNK_SIZE):
+    """
+    Decrypt an open text file into another one chunk by chunk (see playfair_encrypt_stream).
+    """
+    _playfair_stream(in_fp, out_fp, get_digraph_table(key, -1), chunk_size)
+
+
+def _playfair_stream(in_fp, out_fp, table: dict, chunk_size: int):
+    """
+    Shared loop for the Playfair stream functions.
+    
+    Digraphs can straddle a chunk boundary, so an unpaired last letter is carried over
+    into the next chunk; only at the end of the file is it padded with 'X'.
+    """
+    leftover = ""
+    for chunk in read_chunks(in_fp, chunk_size):
+        prepared, leftover = pair_letters(leftover + clean_text(chunk), pad=False)
+        out_fp.write(_substitute(prepared, table))
+    
+    prepared, _ = pair_letters(leftover, pad=True)           # Pad a final unpaired letter
+    out_fp.write(_substitute(prepared, table))
@@ -0,0 +1,16 @@
+# Default number of characters read per chunk by the *_stream functions
+CHUNK_SIZE = 64 * 1024
+
+
+def read_chunks(in_fp, chunk_size: int = CHUNK_SIZE):
+    """
+    Yield the contents of an open text file in pieces of at most 'chunk_size' characters.
+    
+    Used by the streaming cipher functions so that only one chunk is held in memory at a time,
+    no matter how large the input file is.
+    """
+    while True:
+        chunk = in_fp.read(chunk_size)
+        if not chunk:                                    # End of file
+            return
+        yield chunk
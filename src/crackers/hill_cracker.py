@@ -1,5 +1,5 @@
 from ciphers.hill import text_to_numbers          # Reuse function to convert letters → numbers (A=0, ..., Z=25)
-from ciphers.affine import mod_inverse            # Reuse modular inverse function (needed for matrix inversion)
+from ciphers.affine import mod_inverse_ct         # Reuse modular inverse function (needed for matrix inversion)
 
 
 def hill_cracker(plaintext: str, ciphertext: str):
@@ -16,12 +16,14 @@ def hill_cracker(plaintext: str, ciphertext: str):
     
     Rearranging: K = C_matrix × P_matrix⁻¹  (mod 26)
     
-    This function computes exactly that using only the first four letters.
+    Any two digraphs will do, as long as their plaintext matrix is invertible mod 26.
+    The digraph pairs are tried in order — (1st, 2nd), (1st, 3rd), ..., (2nd, 3rd), ... —
+    and the first invertible one is used. Usually that is simply the first four letters.
     
     Requirements:
         - Plaintext and ciphertext must correspond exactly.
         - Both must have the same even number of alphabetic characters (≥4).
-        - The first four plaintext letters must form an invertible matrix mod 26.
+        - At least one pair of plaintext digraphs must form an invertible matrix mod 26.
     
     Returns: The recovered 2×2 key matrix as a list of lists of integers.
     """
@@ -38,32 +40,52 @@ def hill_cracker(plaintext: str, ciphertext: str):
     if len(p_nums) % 2 != 0:
         raise ValueError("Number of letters must be even (no padding mismatch allowed here)")
     
-    # Step 3: Form 2×2 plaintext matrix P using the first four letters as columns
-    #     First digraph  → first column: [p0, p1]
-    #     Second digraph → second column: [p2, p3]
+    # Step 3: Find two plaintext digraphs i < j whose matrix is invertible mod 26
+    #     Digraph k is the pair (p_nums[2k], p_nums[2k+1]); using digraphs i and j as columns:
+    #     det(P) = (p[2i] * p[2j+1] - p[2j] * p[2i+1]) mod 26
+    #     det(P) has an inverse only if gcd(det, 26) == 1, i.e. it is odd and not a multiple of 13.
+    #     That check is a cheap filter, so no inverse is computed for pairs that cannot work.
+    #     The determinant depends only on the two digraph values, so a repeated digraph can never
+    #     succeed where its first occurrence failed. Only the first occurrence of each distinct
+    #     digraph is searched: at most 676 candidates, whatever the length of the text.
+    first_seen = {}
+    for k in range(len(p_nums) // 2):
+        first_seen.setdefault((p_nums[2 * k], p_nums[2 * k + 1]), k)
+    candidates = list(first_seen.values())           # Digraph indices, in text order
+    
+    found = None
+    for a, i in enumerate(candidates):
+        for j in candidates[a + 1:]:
+            det = (p_nums[2 * i] * p_nums[2 * j + 1] - p_nums[2 * j] * p_nums[2 * i + 1]) % 26
+            if det % 2 != 0 and det % 13 != 0:
+                found = (i, j, det)
+                break
+        if found:
+            break
+    
+    if found is None:
+        raise ValueError(
+            "No pair of plaintext digraphs forms an invertible matrix mod 26. "
+            "Try using more or different known text."
+        )
+    i, j, det_p = found
+    
+    # Step 4: Form 2×2 plaintext matrix P using the chosen digraphs as columns
+    #     Digraph i → first column:  [p(2i), p(2i+1)]
+    #     Digraph j → second column: [p(2j), p(2j+1)]
     P = [
-        [p_nums[0], p_nums[2]],   # Row 0: first letter of each digraph
-        [p_nums[1], p_nums[3]]    # Row 1: second letter of each digraph
+        [p_nums[2 * i], p_nums[2 * j]],           # Row 0: first letter of each digraph
+        [p_nums[2 * i + 1], p_nums[2 * j + 1]]    # Row 1: second letter of each digraph
     ]
     
-    # Step 4: Form 2×2 ciphertext matrix C in the same way
+    # Step 5: Form 2×2 ciphertext matrix C from the same digraphs
     C = [
-        [c_nums[0], c_nums[2]],
-        [c_nums[1], c_nums[3]]
+        [c_nums[2 * i], c_nums[2 * j]],
+        [c_nums[2 * i + 1], c_nums[2 * j + 1]]
     ]
     
-    # Step 5: Compute determinant of P modulo 26
-    #     det(P) = (P[0][0] * P[1][1] - P[0][1] * P[1][0]) mod 26
-    det_p = (P[0][0] * P[1][1] - P[0][1] * P[1][0]) % 26
-    
-    # Step 6: Find modular inverse of det(P) modulo 26
-    #     This exists only if gcd(det_p, 26) == 1
-    inv_det = mod_inverse(det_p, 26)
-    if not inv_det:
-        raise ValueError(
-            "The first four plaintext letters form a non-invertible matrix mod 26. "
-            "Try using different starting letters or more known text."
-        )
+    # Step 6: Find modular inverse of det(P) modulo 26 (guaranteed to exist after the filter above)
+    inv_det = mod_inverse_ct(det_p, 26)
     
     # Step 7: Compute inverse of P: inv_P = (1/det) × adjugate(P) mod 26
     #     Adjugate: swap diagonal, negate off-diagonal
@@ -1,21 +1,91 @@
+import argparse
+import os
+import shutil
 import sys
-from ciphers.caesar import caesar_encrypt, caesar_decrypt
-from ciphers.affine import affine_encrypt, affine_decrypt
-from ciphers.playfair import playfair_encrypt, playfair_decrypt
-from ciphers.hill import hill_encrypt, hill_decrypt
+import tempfile
+from ciphers.caesar import caesar_encrypt, caesar_decrypt, caesar_encrypt_stream, caesar_decrypt_stream
+from ciphers.affine import affine_encrypt, affine_decrypt, affine_encrypt_stream, affine_decrypt_stream
+from ciphers.playfair import playfair_encrypt, playfair_decrypt, playfair_encrypt_stream, playfair_decrypt_stream
+from ciphers.hill import hill_encrypt, hill_decrypt, hill_encrypt_stream, hill_decrypt_stream
 from crackers.hill_cracker import hill_cracker
 
+# Main menu, written to stdout in one call per screen
+MENU = "\n".join([
+    "",
+    "=== Crypto Tool ===",
+    "1. Caesar Cipher",
+    "2. Affine Cipher",
+    "3. Playfair Cipher",
+    "4. Hill Cipher",
+    "5. Hill Cipher Cracker (Known Plaintext Attack)",
+    "6. Exit",
+])
+
+
+def prompt(message: str) -> str:
+    """
+    Show 'message' and read one line from stdin — a drop-in for input().
+    
+    Output is block-buffered (see main), so the buffer is flushed here, once per prompt,
+    right before we wait for the user. Raises EOFError at end of input, like input().
+    """
+    sys.stdout.write(message)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+
+def run_stream(files, stream_fn, *key):
+    """
+    Run a cipher's *_stream function from the input file to the output file (--file IN OUT),
+    so large files are processed chunk by chunk instead of being read into memory at once.
+    
+    The result is written to a temporary file next to OUT and only moved over OUT once the
+    whole input has been processed, so a bad key or unreadable input leaves OUT untouched.
+    """
+    in_path, out_path = files
+    if os.path.exists(out_path) and os.path.samefile(in_path, out_path):
+        raise ValueError("Input and output files must be different (the output is overwritten)")
+    
+    out_dir = os.path.dirname(os.path.abspath(out_path))
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, prefix=".crypto-", suffix=".tmp")
+    try:
+        with open(in_path, encoding="utf-8", newline="") as in_fp, \
+                open(fd, "w", encoding="utf-8", newline="") as out_fp:
+            stream_fn(in_fp, out_fp, *key)
+        
+        # mkstemp creates the file as owner-only; give it the permissions OUT would normally get
+        if os.path.exists(out_path):
+            shutil.copymode(out_path, tmp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.unlink(tmp_path)                              # Discard the partial result
+        raise
+    print(f"Result written to {out_path}")
+
+
 # Main console interface
 def main():
+    parser = argparse.ArgumentParser(description="Classical cipher console tool")
+    parser.add_argument("--file", nargs=2, metavar=("IN", "OUT"),
+                        help="encrypt/decrypt the text in file IN and write the result to file OUT "
+                             "instead of typing it in (options 1-4)")
+    files = parser.parse_args().file
+    
+    # Don't flush after every line; prompt() flushes once before each read.
+    # This matters when the tool is driven by piped/scripted input.
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
+    
     while True:
-        print("\n=== Crypto Tool ===")
-        print("1. Caesar Cipher")
-        print("2. Affine Cipher")
-        print("3. Playfair Cipher")
-        print("4. Hill Cipher")
-        print("5. Hill Cipher Cracker (Known Plaintext Attack)")
-        print("6. Exit")
-        choice = input("Select option (1-6): ").strip()
+        sys.stdout.write(MENU + "\n")
+        choice = prompt("Select option (1-6): ").strip()
         
         if choice == '6':
             print("Exiting...")
@@ -28,62 +98,70 @@ def main():
         if choice in ['1', '2', '3', '4']:
             print("\na. Encrypt")
             print("b. Decrypt")
-            op = input("Select operation (a/b): ").strip().lower()
+            op = prompt("Select operation (a/b): ").strip().lower()
             if op not in ['a', 'b']:
                 print("Invalid operation. Try again.")
                 continue
             
             try:
                 if choice == '1':
-                    shift = int(input("Enter shift (integer): "))
-                    if op == 'a':
-                        text = input("Enter plaintext: ")
+                    shift = int(prompt("Enter shift (integer): "))
+                    if files:
+                        run_stream(files, caesar_encrypt_stream if op == 'a' else caesar_decrypt_stream, shift)
+                    elif op == 'a':
+                        text = prompt("Enter plaintext: ")
                         print("Encrypted:", caesar_encrypt(text, shift))
                     else:
-                        text = input("Enter ciphertext: ")
+                        text = prompt("Enter ciphertext: ")
                         print("Decrypted:", caesar_decrypt(text, shift))
                 
                 elif choice == '2':
-                    a = int(input("Enter a (coprime with 26): "))
-                    b = int(input("Enter b: "))
-                    if op == 'a':
-                        text = input("Enter plaintext: ")
+                    a = int(prompt("Enter a (coprime with 26): "))
+                    b = int(prompt("Enter b: "))
+                    if files:
+                        run_stream(files, affine_encrypt_stream if op == 'a' else affine_decrypt_stream, a, b)
+                    elif op == 'a':
+                        text = prompt("Enter plaintext: ")
                         print("Encrypted:", affine_encrypt(text, a, b))
                     else:
-                        text = input("Enter ciphertext: ")
+                        text = prompt("Enter ciphertext: ")
                         print("Decrypted:", affine_decrypt(text, a, b))
                 
                 elif choice == '3':
-                    key = input("Enter key (string): ")
-                    if op == 'a':
-                        text = input("Enter plaintext: ")
+                    key = prompt("Enter key (string): ")
+                    if files:
+                        run_stream(files, playfair_encrypt_stream if op == 'a' else playfair_decrypt_stream, key)
+                    elif op == 'a':
+                        text = prompt("Enter plaintext: ")
                         print("Encrypted:", playfair_encrypt(text, key))
                     else:
-                        text = input("Enter ciphertext: ")
+                        text = prompt("Enter ciphertext: ")
                         print("Decrypted:", playfair_decrypt(text, key))
                 
                 elif choice == '4':
                     print("Enter 2x2 key matrix (integers 0-25):")
-                    a = int(input("Row 1, Col 1: "))
-                    b = int(input("Row 1, Col 2: "))
-                    c = int(input("Row 2, Col 1: "))
-                    d = int(input("Row 2, Col 2: "))
+                    a = int(prompt("Row 1, Col 1: "))
+                    b = int(prompt("Row 1, Col 2: "))
+                    c = int(prompt("Row 2, Col 1: "))
+                    d = int(prompt("Row 2, Col 2: "))
                     key_matrix = [[a, b], [c, d]]
-                    if op == 'a':
-                        text = input("Enter plaintext: ")
+                    if files:
+                        run_stream(files, hill_encrypt_stream if op == 'a' else hill_decrypt_stream, key_matrix)
+                    elif op == 'a':
+                        text = prompt("Enter plaintext: ")
                         print("Encrypted:", hill_encrypt(text, key_matrix))
                     else:
-                        text = input("Enter ciphertext: ")
+                        text = prompt("Enter ciphertext: ")
                         print("Decrypted:", hill_decrypt(text, key_matrix))
             
-            except ValueError as e:
+            except (ValueError, OSError) as e:                # OSError: --file paths unreadable/unwritable
                 print(f"Error: {e}")
                 print("Please check your inputs and try again.")
         
         elif choice == '5':
             try:
-                plaintext = input("Enter known plaintext (at least 4 letters): ")
-                ciphertext = input("Enter corresponding ciphertext (same length): ")
+                plaintext = prompt("Enter known plaintext (at least 4 letters): ")
+                ciphertext = prompt("Enter corresponding ciphertext (same length): ")
                 key = hill_cracker(plaintext, ciphertext)
                 print("Recovered key matrix:")
                 print(f"[[{key[0][0]}, {key[0][1]}],")